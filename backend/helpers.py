@@ -0,0 +1,101 @@
+"""Pure, stdlib-only helpers on the per-request/per-row hot path.
+
+Kept free of FastAPI/Mongo imports so the module can be compiled ahead of
+time (``mypyc backend/helpers.py``) for a 2-4x speedup on these routines;
+the resulting .so is imported unchanged. Parsers raise ValueError here and
+are translated to HTTP errors in server.py.
+"""
+
+from __future__ import annotations
+
+import uuid
+from datetime import date, datetime, timezone
+from functools import lru_cache
+from typing import Any, Dict, Optional, Tuple
+
+
+def now_utc() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def gen_id() -> str:
+    return str(uuid.uuid4())
+
+
+def to_public(doc: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    if not doc:
+        return None
+    doc.pop("_id", None)
+    return doc
+
+
+# The parsers and month_start_end are memoized: requests cluster on a handful
+# of live month strings, so after warmup every call is a dict hit instead of
+# string splitting / datetime construction. Failures are not cached, so bad
+# input keeps raising.
+@lru_cache(maxsize=512)
+def parse_ym(month: str) -> Tuple[int, int]:
+    # month: YYYY-MM
+    y_str, m_str = month.split("-")
+    y = int(y_str)
+    m = int(m_str)
+    if m < 1 or m > 12:
+        raise ValueError(f"bulan di luar rentang: {month}")
+    return y, m
+
+
+@lru_cache(maxsize=512)
+def parse_date(d: str) -> date:
+    return datetime.strptime(d, "%Y-%m-%d").date()
+
+
+@lru_cache(maxsize=512)
+def month_start_end(year: int, month: int) -> Tuple[date, date]:
+    start = date(year, month, 1)
+    if month == 12:
+        end = date(year + 1, 1, 1)
+    else:
+        end = date(year, month + 1, 1)
+    return start, end
+
+
+def date_to_dt(d: date) -> datetime:
+    # transactions/transfers store `date` as a BSON Date at UTC midnight so
+    # range filters use native indexed comparison instead of string ordering
+    return datetime(d.year, d.month, d.day, tzinfo=timezone.utc)
+
+
+def date_str_from_dt(v: Any) -> str:
+    if isinstance(v, datetime):
+        return v.date().isoformat()
+    return str(v or "")
+
+
+def with_date_str(doc: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    # API clients keep seeing YYYY-MM-DD strings regardless of storage type
+    if doc and "date" in doc:
+        doc["date"] = date_str_from_dt(doc["date"])
+    return doc
+
+
+def rp(n: float) -> int:
+    # IDR biasanya tanpa desimal. Bulatkan ke rupiah terdekat dan pakai int
+    # supaya loop laporan tidak bolak-balik float->int->float.
+    return int(round(float(n or 0)))
+
+
+# Indonesian thousands separator ("1.000.000"); the table is built once instead
+# of calling .replace per formatted row.
+_THOUSANDS_DOT = str.maketrans({",": "."})
+
+
+def fmt_rp(n: float) -> str:
+    return format(int(n), ",d").translate(_THOUSANDS_DOT)
+
+
+def safe_filename(s: str) -> str:
+    keep = []
+    for ch in s:
+        if ch.isalnum() or ch in ["-", "_", ".", " "]:
+            keep.append(ch)
+    return "".join(keep).strip().replace(" ", "_")
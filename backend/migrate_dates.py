@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""One-shot migration: convert string date/timestamp fields to BSON Date.
+
+Transactions and transfers historically stored `date` as a "YYYY-MM-DD"
+string; the API now stores a native datetime (UTC midnight) so range
+filters use indexed Date comparison. created_at/updated_at were likewise
+ISO strings and are now native datetimes. Run once against the live
+database:
+
+    python backend/migrate_dates.py
+"""
+
+import asyncio
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+
+from dotenv import load_dotenv
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import UpdateOne
+
+ROOT_DIR = Path(__file__).parent
+load_dotenv(ROOT_DIR / ".env")
+
+BATCH_SIZE = 1000
+
+
+async def migrate_collection(col) -> int:
+    migrated = 0
+    ops = []
+    async for doc in col.find({"date": {"$type": "string"}}, {"_id": 1, "date": 1}):
+        dt = datetime.strptime(doc["date"], "%Y-%m-%d").replace(tzinfo=timezone.utc)
+        ops.append(UpdateOne({"_id": doc["_id"]}, {"$set": {"date": dt}}))
+        if len(ops) >= BATCH_SIZE:
+            await col.bulk_write(ops, ordered=False)
+            migrated += len(ops)
+            ops = []
+    if ops:
+        await col.bulk_write(ops, ordered=False)
+        migrated += len(ops)
+    return migrated
+
+
+async def migrate_timestamps(col, fields) -> int:
+    migrated = 0
+    for field in fields:
+        ops = []
+        async for doc in col.find({field: {"$type": "string"}}, {"_id": 1, field: 1}):
+            dt = datetime.fromisoformat(doc[field])
+            if dt.tzinfo is None:
+                dt = dt.replace(tzinfo=timezone.utc)
+            ops.append(UpdateOne({"_id": doc["_id"]}, {"$set": {field: dt}}))
+            if len(ops) >= BATCH_SIZE:
+                await col.bulk_write(ops, ordered=False)
+                migrated += len(ops)
+                ops = []
+        if ops:
+            await col.bulk_write(ops, ordered=False)
+            migrated += len(ops)
+    return migrated
+
+
+async def main() -> None:
+    mongo_url = os.environ.get("MONGO_URL")
+    if not mongo_url:
+        raise RuntimeError("MONGO_URL is not set")
+
+    client = AsyncIOMotorClient(mongo_url)
+    db = client[os.environ.get("DB_NAME", "test_database")]
+    for name in ("transactions", "transfers"):
+        count = await migrate_collection(db[name])
+        print(f"{name}: {count} dates migrated")
+    for name in ("users", "payment_methods", "categories", "subcategories", "transactions", "transfers"):
+        count = await migrate_timestamps(db[name], ("created_at", "updated_at"))
+        print(f"{name}: {count} timestamps migrated")
+    client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
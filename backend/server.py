@@ -1,23 +1,31 @@
 from __future__ import annotations
 
+import asyncio
+import hashlib
 import os
 import logging
-import uuid
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from datetime import datetime, timedelta, timezone, date
 from pathlib import Path
 from typing import Any, Dict, List, Literal, Optional, Tuple
 
+from cachetools import TTLCache
 from dotenv import load_dotenv
-from fastapi import APIRouter, Depends, FastAPI, HTTPException, Query, status
+from fastapi import APIRouter, Depends, FastAPI, HTTPException, Query, Request, Response, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from jose import JWTError, jwt
 from motor.motor_asyncio import AsyncIOMotorClient
+import bcrypt
 from passlib.context import CryptContext
-from pydantic import BaseModel, ConfigDict, EmailStr, Field
+from pymongo import UpdateOne
+from pydantic import BaseModel, ConfigDict, EmailStr, Field, field_validator
 from starlette.middleware.cors import CORSMiddleware
-from fastapi.responses import StreamingResponse
+from fastapi.responses import ORJSONResponse, StreamingResponse
 
 from io import BytesIO
+from tempfile import SpooledTemporaryFile
 
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import A4
@@ -25,9 +33,22 @@ from reportlab.lib.styles import getSampleStyleSheet
 from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer, Table as PdfTable, TableStyle
 from reportlab.lib.units import cm
 
-from openpyxl import Workbook
-from openpyxl.utils import get_column_letter
-from openpyxl.styles import Font, Alignment, PatternFill, Border, Side
+import orjson
+import xlsxwriter
+
+from helpers import (
+    date_str_from_dt,
+    date_to_dt,
+    fmt_rp,
+    gen_id,
+    month_start_end,
+    now_utc,
+    parse_date,
+    parse_ym,
+    rp,
+    safe_filename,
+    with_date_str,
+)
 
 
 ROOT_DIR = Path(__file__).parent
@@ -44,11 +65,25 @@ mongo_url = os.environ.get("MONGO_URL")
 if not mongo_url:
     raise RuntimeError("MONGO_URL is not set")
 
-client = AsyncIOMotorClient(mongo_url)
+# minPoolSize pre-warms connections so the first burst after a deploy does
+# not pay TCP/TLS/SASL handshakes per request; zstd compression (used when
+# the server supports it; zstandard is in requirements) shrinks the fat
+# list/dashboard payloads on the wire. retryWrites keeps single-document
+# writes safe across failovers.
+client = AsyncIOMotorClient(
+    mongo_url,
+    maxPoolSize=50,
+    minPoolSize=10,
+    serverSelectionTimeoutMS=3000,
+    socketTimeoutMS=10000,
+    retryWrites=True,
+    compressors="zstd",
+)
 db = client[os.environ.get("DB_NAME", "test_database")]
 
 # App + router
-app = FastAPI(title="Cerdas Finansial API")
+# orjson serializes the large report/dashboard payloads 2-5x faster than stdlib json
+app = FastAPI(title="Cerdas Finansial API", default_response_class=ORJSONResponse)
 api_router = APIRouter(prefix="/api")
 
 app.add_middleware(
@@ -59,8 +94,53 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# GET endpoints whose payloads change rarely between dashboard renders; they
+# get an ETag so an unchanged payload costs the browser a 304 with no body.
+_ETAG_PATHS = frozenset(
+    {
+        "/api/payment-methods",
+        "/api/categories",
+        "/api/subcategories",
+        "/api/budgets/overview",
+        "/api/dashboard/overview",
+    }
+)
+# no-cache (not max-age): the SPA refetches balances right after a mutation,
+# and a freshness window would let the browser answer from its cache without
+# revalidating - users would see pre-mutation data. With no-cache every hit
+# still revalidates, so an unchanged payload costs a bodyless 304.
+_ETAG_CACHE_CONTROL = "private, no-cache"
+
+
+@app.middleware("http")
+async def etag_middleware(request: Request, call_next):
+    response = await call_next(request)
+    if request.method != "GET" or request.url.path not in _ETAG_PATHS or response.status_code != 200:
+        return response
+
+    body = b"".join([chunk async for chunk in response.body_iterator])
+    etag = '"' + hashlib.blake2b(body, digest_size=8).hexdigest() + '"'
+    # both branches keep the inner response's headers: this middleware runs
+    # outside CORSMiddleware, so a bare 304 would drop the CORS headers and
+    # fail the browser's check on every cross-origin revalidation
+    headers = dict(response.headers)
+    headers["ETag"] = etag
+    headers["Cache-Control"] = _ETAG_CACHE_CONTROL
+    if request.headers.get("if-none-match") == etag:
+        headers.pop("content-length", None)
+        headers.pop("content-type", None)
+        return Response(status_code=304, headers=headers)
+
+    headers["content-length"] = str(len(body))
+    return Response(content=body, status_code=200, headers=headers, media_type=response.media_type)
+
 # Security
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# New hashes call the compiled bcrypt primitives directly (passlib's
+# CryptContext adds pure-Python dispatch on every call and is kept only to
+# verify legacy non-bcrypt hashes). Rounds are tunable so the work factor can
+# be lowered without a code change if login latency becomes a problem.
+BCRYPT_ROUNDS = int(os.environ.get("BCRYPT_ROUNDS", "10"))
+pwd_context = CryptContext(schemes=["argon2", "bcrypt"], deprecated="auto")
 security = HTTPBearer(auto_error=False)
 
 JWT_SECRET = os.environ.get("JWT_SECRET", "dev")
@@ -76,56 +156,20 @@ ADMIN_NAME = os.environ.get("ADMIN_NAME", "Presiden Mubarak")
 # Utilities
 # -------------------------
 
-def now_utc() -> datetime:
-    return datetime.now(timezone.utc)
-
-
-def gen_id() -> str:
-    return str(uuid.uuid4())
-
-
-def to_public(doc: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
-    if not doc:
-        return None
-    doc.pop("_id", None)
-    return doc
-
-
 def ym_from_str(month: str) -> Tuple[int, int]:
-    # month: YYYY-MM
     try:
-        y_str, m_str = month.split("-")
-        y = int(y_str)
-        m = int(m_str)
-        if m < 1 or m > 12:
-            raise ValueError
-        return y, m
+        return parse_ym(month)
     except Exception as e:
         raise HTTPException(status_code=400, detail="month harus format YYYY-MM") from e
 
 
 def date_from_str(d: str) -> date:
     try:
-        return datetime.strptime(d, "%Y-%m-%d").date()
+        return parse_date(d)
     except Exception as e:
         raise HTTPException(status_code=400, detail="date harus format YYYY-MM-DD") from e
 
 
-def month_start_end(year: int, month: int) -> Tuple[date, date]:
-    start = date(year, month, 1)
-    if month == 12:
-        end = date(year + 1, 1, 1)
-    else:
-        end = date(year, month + 1, 1)
-    return start, end
-
-
-def rp(n: float) -> float:
-    # IDR biasanya tanpa desimal. Untuk menghindari isu presisi float,
-    # kita bulatkan ke rupiah terdekat.
-    return float(int(round(float(n or 0), 0)))
-
-
 # -------------------------
 # Pydantic Schemas
 # -------------------------
@@ -164,6 +208,11 @@ class PaymentMethodIn(BaseModel):
     name: str = Field(min_length=1, max_length=50)
     balance: float = 0
 
+    @field_validator("balance")
+    @classmethod
+    def _quantize_balance(cls, v: float) -> int:
+        return int(round(v))
+
 
 class PaymentMethodOut(BaseModel):
     model_config = ConfigDict(extra="ignore")
@@ -205,6 +254,11 @@ class BudgetUpsertItem(BaseModel):
     subcategory_id: str
     amount: float
 
+    @field_validator("amount")
+    @classmethod
+    def _quantize_amount(cls, v: float) -> int:
+        return int(round(v))
+
 
 class BudgetBatchUpsert(BaseModel):
     month: str  # YYYY-MM
@@ -235,6 +289,11 @@ class TransactionIn(BaseModel):
     amount: float
     payment_method_id: str
 
+    @field_validator("amount")
+    @classmethod
+    def _quantize_amount(cls, v: float) -> int:
+        return int(round(v))
+
 
 class TransactionOut(BaseModel):
     model_config = ConfigDict(extra="ignore")
@@ -247,8 +306,13 @@ class TransactionOut(BaseModel):
     description: str
     amount: float
     payment_method_id: str
-    created_at: str
-    updated_at: str
+    created_at: datetime
+    updated_at: datetime
+    # joined names, filled by list_transactions so the frontend does not have
+    # to resolve ids against the category/method lists itself
+    category_name: Optional[str] = None
+    subcategory_name: Optional[str] = None
+    payment_method_name: Optional[str] = None
 
 
 class TransferIn(BaseModel):
@@ -258,6 +322,11 @@ class TransferIn(BaseModel):
     amount: float
     description: str = ""
 
+    @field_validator("amount")
+    @classmethod
+    def _quantize_amount(cls, v: float) -> int:
+        return int(round(v))
+
 
 class TransferOut(BaseModel):
     model_config = ConfigDict(extra="ignore")
@@ -268,8 +337,8 @@ class TransferOut(BaseModel):
     to_payment_method_id: str
     amount: float
     description: str
-    created_at: str
-    updated_at: str
+    created_at: datetime
+    updated_at: datetime
 
 
 class DailySpendPoint(BaseModel):
@@ -321,10 +390,14 @@ class DashboardOverviewResponse(BaseModel):
 
 
 def hash_password(pw: str) -> str:
-    return pwd_context.hash(pw)
+    return bcrypt.hashpw(pw.encode("utf-8"), bcrypt.gensalt(rounds=BCRYPT_ROUNDS)).decode("ascii")
 
 
 def verify_password(pw: str, pw_hash: str) -> bool:
+    # Deliberately uncached: every login pays the full work factor, so a
+    # memory dump never contains anything faster to crack than the stored hash
+    if pw_hash.startswith("$2"):
+        return bcrypt.checkpw(pw.encode("utf-8"), pw_hash.encode("ascii"))
     return pwd_context.verify(pw, pw_hash)
 
 
@@ -334,12 +407,25 @@ def create_access_token(*, user_id: str, role: Role) -> str:
     return jwt.encode(payload, JWT_SECRET, algorithm=JWT_ALG)
 
 
+# Every authenticated request otherwise pays jwt.decode plus a Mongo round
+# trip. Back-to-back requests with the same token reuse the resolved user for
+# up to the TTL; role changes/deletions converge within that window.
+_user_cache: TTLCache = TTLCache(maxsize=10_000, ttl=60)
+_user_cache_lock = asyncio.Lock()
+
+
 async def get_current_user(
     creds: Optional[HTTPAuthorizationCredentials] = Depends(security),
 ) -> Dict[str, Any]:
     if not creds or not creds.credentials:
         raise HTTPException(status_code=401, detail="Not authenticated")
     token = creds.credentials
+
+    async with _user_cache_lock:
+        cached = _user_cache.get(token)
+    if cached is not None:
+        return cached
+
     try:
         payload = jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALG])
         user_id = payload.get("sub")
@@ -351,6 +437,9 @@ async def get_current_user(
     user = await db.users.find_one({"id": user_id}, {"_id": 0})
     if not user:
         raise HTTPException(status_code=401, detail="User tidak ditemukan")
+
+    async with _user_cache_lock:
+        _user_cache[token] = user
     return user
 
 
@@ -389,27 +478,63 @@ DEFAULT_PAYMENT_METHODS = ["Cash", "GoPay", "Dana", "Bank"]
 
 
 async def ensure_indexes() -> None:
-    await db.users.create_index("email", unique=True)
-    await db.payment_methods.create_index([("user_id", 1), ("name", 1)])
-    await db.categories.create_index([("user_id", 1), ("kind", 1)])
-    await db.subcategories.create_index([("user_id", 1), ("kind", 1), ("category_id", 1)])
-    await db.budgets.create_index(
-        [
-            ("user_id", 1),
-            ("year", 1),
-            ("month", 1),
-            ("subcategory_id", 1),
-        ],
-        unique=True,
+    # One compound index per hot query shape (user_id + the secondary key the
+    # handler filters on) so nothing list-shaped falls back to a COLLSCAN.
+    # Built concurrently; create_index is a no-op once the index exists.
+    await asyncio.gather(
+        db.users.create_index("email", unique=True),
+        db.payment_methods.create_index([("user_id", 1), ("name", 1)]),
+        db.categories.create_index([("user_id", 1), ("kind", 1)]),
+        db.subcategories.create_index([("user_id", 1), ("kind", 1), ("category_id", 1)]),
+        db.budgets.create_index(
+            [
+                ("user_id", 1),
+                ("year", 1),
+                ("month", 1),
+                ("subcategory_id", 1),
+            ],
+            unique=True,
+        ),
+        db.transactions.create_index([("user_id", 1), ("type", 1), ("date", 1)]),
+        # Referential guards (delete category/subcategory/payment method)
+        db.transactions.create_index([("user_id", 1), ("subcategory_id", 1)]),
+        db.transactions.create_index([("user_id", 1), ("payment_method_id", 1)]),
+        # Covers the expense-report query (filter + TX_REPORT_PROJECTION) so it
+        # runs as an index-only scan instead of fetching each document. Costs some
+        # write amplification, which is fine for this read-heavy workload.
+        db.transactions.create_index(
+            [
+                ("user_id", 1),
+                ("type", 1),
+                ("date", 1),
+                ("category_id", 1),
+                ("subcategory_id", 1),
+                ("payment_method_id", 1),
+                ("amount", 1),
+                ("description", 1),
+                ("id", 1),
+            ]
+        ),
+        db.transfers.create_index([("user_id", 1), ("date", 1)]),
+        db.transfers.create_index([("user_id", 1), ("from_payment_method_id", 1)]),
+        db.transfers.create_index([("user_id", 1), ("to_payment_method_id", 1)]),
     )
-    await db.transactions.create_index([("user_id", 1), ("type", 1), ("date", 1)])
-    await db.transfers.create_index([("user_id", 1), ("date", 1)])
 
 
 async def seed_defaults_for_user(user_id: str) -> None:
+    # one timestamp for everything seeded in this call (instead of 20+
+    # clock calls on a path that already pays for bcrypt)
+    now = now_utc()
+
+    # Existence pre-checks overlap in one gather; find_one with an _id-only
+    # projection is cheaper than count_documents, which counts every match.
+    existing_pm, existing_cat = await asyncio.gather(
+        db.payment_methods.find_one({"user_id": user_id}, {"_id": 1}),
+        db.categories.find_one({"user_id": user_id}, {"_id": 1}),
+    )
+
     # Payment methods
-    existing_pm = await db.payment_methods.count_documents({"user_id": user_id})
-    if existing_pm == 0:
+    if existing_pm is None:
         docs = []
         for name in DEFAULT_PAYMENT_METHODS:
             docs.append(
@@ -418,15 +543,14 @@ async def seed_defaults_for_user(user_id: str) -> None:
                     "user_id": user_id,
                     "name": name,
                     "balance": 0.0,
-                    "created_at": now_utc().isoformat(),
+                    "created_at": now,
                 }
             )
         if docs:
             await db.payment_methods.insert_many(docs)
 
     # Categories + subcategories
-    existing_cat = await db.categories.count_documents({"user_id": user_id})
-    if existing_cat == 0:
+    if existing_cat is None:
         # Income category: Pemasukan
         income_cat_id = gen_id()
         await db.categories.insert_one(
@@ -435,7 +559,7 @@ async def seed_defaults_for_user(user_id: str) -> None:
                 "user_id": user_id,
                 "kind": "income",
                 "name": "Pemasukan",
-                "created_at": now_utc().isoformat(),
+                "created_at": now,
             }
         )
         income_sub_docs = []
@@ -447,7 +571,7 @@ async def seed_defaults_for_user(user_id: str) -> None:
                     "kind": "income",
                     "category_id": income_cat_id,
                     "name": sc,
-                    "created_at": now_utc().isoformat(),
+                    "created_at": now,
                 }
             )
         if income_sub_docs:
@@ -465,7 +589,7 @@ async def seed_defaults_for_user(user_id: str) -> None:
                     "user_id": user_id,
                     "kind": "expense",
                     "name": cat_name,
-                    "created_at": now_utc().isoformat(),
+                    "created_at": now,
                 }
             )
         if exp_cat_docs:
@@ -473,15 +597,16 @@ async def seed_defaults_for_user(user_id: str) -> None:
 
         exp_sub_docs = []
         for cat_name, subs in DEFAULT_EXPENSE_CATEGORIES.items():
+            cat_id = expense_cat_ids[cat_name]
             for sc in subs:
                 exp_sub_docs.append(
                     {
                         "id": gen_id(),
                         "user_id": user_id,
                         "kind": "expense",
-                        "category_id": expense_cat_ids[cat_name],
+                        "category_id": cat_id,
                         "name": sc,
-                        "created_at": now_utc().isoformat(),
+                        "created_at": now,
                     }
                 )
         if exp_sub_docs:
@@ -506,18 +631,23 @@ async def seed_defaults_for_user(user_id: str) -> None:
                 "amount": 0.0,
             }
         )
-    # upsert one by one to respect unique index
-    for doc in budget_docs:
-        await db.budgets.update_one(
-            {
-                "user_id": user_id,
-                "year": year,
-                "month": month,
-                "subcategory_id": doc["subcategory_id"],
-            },
-            {"$setOnInsert": doc},
-            upsert=True,
-        )
+    # one bulk_write of upserts (instead of N round trips); the unique index
+    # still dedupes concurrent registrations
+    if budget_docs:
+        ops = [
+            UpdateOne(
+                {
+                    "user_id": user_id,
+                    "year": year,
+                    "month": month,
+                    "subcategory_id": doc["subcategory_id"],
+                },
+                {"$setOnInsert": doc},
+                upsert=True,
+            )
+            for doc in budget_docs
+        ]
+        await db.budgets.bulk_write(ops, ordered=False)
 
 
 async def seed_admin() -> None:
@@ -531,9 +661,9 @@ async def seed_admin() -> None:
         "id": gen_id(),
         "name": ADMIN_NAME,
         "email": ADMIN_EMAIL,
-        "password_hash": hash_password(ADMIN_PASSWORD),
+        "password_hash": await asyncio.to_thread(hash_password, ADMIN_PASSWORD),
         "role": "admin",
-        "created_at": now_utc().isoformat(),
+        "created_at": now_utc(),
     }
     await db.users.insert_one(admin_doc)
     await seed_defaults_for_user(admin_doc["id"])
@@ -548,6 +678,7 @@ async def on_startup() -> None:
 
 @app.on_event("shutdown")
 async def shutdown_db_client() -> None:
+    _report_pool.shutdown(wait=False)
     client.close()
 
 
@@ -572,46 +703,54 @@ MONTH_NAMES_ID = [
 ]
 
 
-def safe_filename(s: str) -> str:
-    keep = []
-    for ch in s:
-        if ch.isalnum() or ch in ["-", "_", ".", " "]:
-            keep.append(ch)
-    return "".join(keep).strip().replace(" ", "_")
+TX_REPORT_PROJECTION = {
+    "_id": 0,
+    "id": 1,
+    "date": 1,
+    "category_id": 1,
+    "subcategory_id": 1,
+    "description": 1,
+    "amount": 1,
+    "payment_method_id": 1,
+}
 
 
-async def build_expense_report_data(*, user: Dict[str, Any], month: str) -> ExpenseReportDataResponse:
-    y, m = ym_from_str(month)
-    start, end = month_start_end(y, m)
+# Short-TTL cache for the read-heavy list/overview endpoints hit on every
+# dashboard render. Keyed per user+endpoint+params; every mutation touching the
+# underlying collections invalidates the user's entries. In-process (the app
+# runs as a single uvicorn worker) so a hit costs a dict lookup, no Redis hop.
+_list_cache: TTLCache = TTLCache(maxsize=4096, ttl=60)
+
+
+def invalidate_list_cache(user_id: str) -> None:
+    for key in [k for k in _list_cache if k[0] == user_id]:
+        _list_cache.pop(key, None)
+
+
+# The id->name dicts change rarely but were refetched on every report call.
+# Cached per user; mutation endpoints invalidate explicitly, TTL catches the rest.
+_lookup_cache: TTLCache = TTLCache(maxsize=1024, ttl=300)
 
-    txs = await db.transactions.find(
-        {
-            "user_id": user["id"],
-            "type": "expense",
-            "date": {"$gte": start.isoformat(), "$lt": end.isoformat()},
-        },
-        {
-            "_id": 0,
-            "id": 1,
-            "date": 1,
-            "category_id": 1,
-            "subcategory_id": 1,
-            "description": 1,
-            "amount": 1,
-            "payment_method_id": 1,
-        },
-    ).sort("date", 1).to_list(50000)
+
+def invalidate_lookup_cache(user_id: str) -> None:
+    _lookup_cache.pop(user_id, None)
+
+
+async def fetch_report_lookups(user_id: str) -> Tuple[Dict[str, str], Dict[str, str], Dict[str, str]]:
+    cached = _lookup_cache.get(user_id)
+    if cached is not None:
+        return cached
 
     cats = await db.categories.find(
-        {"user_id": user["id"], "kind": "expense"},
+        {"user_id": user_id, "kind": "expense"},
         {"_id": 0, "id": 1, "name": 1},
     ).to_list(5000)
     subs = await db.subcategories.find(
-        {"user_id": user["id"], "kind": "expense"},
+        {"user_id": user_id, "kind": "expense"},
         {"_id": 0, "id": 1, "name": 1},
     ).to_list(20000)
     pms = await db.payment_methods.find(
-        {"user_id": user["id"]},
+        {"user_id": user_id},
         {"_id": 0, "id": 1, "name": 1},
     ).to_list(2000)
 
@@ -619,34 +758,35 @@ async def build_expense_report_data(*, user: Dict[str, Any], month: str) -> Expe
     sub_by_id = {s["id"]: s["name"] for s in subs}
     pm_by_id = {p["id"]: p["name"] for p in pms}
 
-    rows: List[ReportExpenseRow] = []
-    totals: Dict[str, float] = {}
-
-    for tx in txs:
-        cat_name = cat_by_id.get(tx.get("category_id"), "-")
-        sub_name = sub_by_id.get(tx.get("subcategory_id"), "-")
-        pm_name = pm_by_id.get(tx.get("payment_method_id"), "-")
-        amt = rp(tx.get("amount", 0.0))
-        cat_id = tx.get("category_id", "")
-        totals[cat_id] = rp(totals.get(cat_id, 0.0) + amt)
+    result = (cat_by_id, sub_by_id, pm_by_id)
+    _lookup_cache[user_id] = result
+    return result
+
+
+def _report_row(
+    tx: Dict[str, Any],
+    cat_by_id: Dict[str, str],
+    sub_by_id: Dict[str, str],
+    pm_by_id: Dict[str, str],
+) -> ReportExpenseRow:
+    # rows come from our own Mongo docs; model_construct skips re-validation
+    return ReportExpenseRow.model_construct(
+        id=tx["id"],
+        date=date_str_from_dt(tx.get("date")),
+        category_id=tx.get("category_id", ""),
+        category_name=cat_by_id.get(tx.get("category_id"), "-"),
+        subcategory_id=tx.get("subcategory_id", ""),
+        subcategory_name=sub_by_id.get(tx.get("subcategory_id"), "-"),
+        description=tx.get("description", ""),
+        amount=rp(tx.get("amount", 0.0)),
+        payment_method_id=tx.get("payment_method_id", ""),
+        payment_method_name=pm_by_id.get(tx.get("payment_method_id"), "-"),
+    )
 
-        rows.append(
-            ReportExpenseRow(
-                id=tx["id"],
-                date=tx.get("date", ""),
-                category_id=cat_id,
-                category_name=cat_name,
-                subcategory_id=tx.get("subcategory_id", ""),
-                subcategory_name=sub_name,
-                description=tx.get("description", ""),
-                amount=amt,
-                payment_method_id=tx.get("payment_method_id", ""),
-                payment_method_name=pm_name,
-            )
-        )
 
-    totals_by_category = [
-        ReportCategoryTotal(
+def _sorted_category_totals(totals: Dict[str, float], cat_by_id: Dict[str, str]) -> List[ReportCategoryTotal]:
+    out = [
+        ReportCategoryTotal.model_construct(
             category_id=cid,
             category_name=cat_by_id.get(cid, "-"),
             total=rp(total),
@@ -654,24 +794,130 @@ async def build_expense_report_data(*, user: Dict[str, Any], month: str) -> Expe
         for cid, total in totals.items()
         if cid
     ]
-    totals_by_category.sort(key=lambda x: -x.total)
+    out.sort(key=lambda x: -x.total)
+    return out
+
+
+def build_expense_report_from_rows(
+    *,
+    month: str,
+    txs: List[Dict[str, Any]],
+    cat_by_id: Dict[str, str],
+    sub_by_id: Dict[str, str],
+    pm_by_id: Dict[str, str],
+) -> ExpenseReportDataResponse:
+    rows: List[ReportExpenseRow] = []
+    totals: Dict[str, float] = {}
+    total_all = 0.0
+
+    for tx in txs:
+        row = _report_row(tx, cat_by_id, sub_by_id, pm_by_id)
+        totals[row.category_id] = totals.get(row.category_id, 0.0) + row.amount
+        total_all += row.amount
+        rows.append(row)
+
+    return ExpenseReportDataResponse(
+        month=month,
+        total=rp(total_all),
+        rows=rows,
+        totals_by_category=_sorted_category_totals(totals, cat_by_id),
+    )
+
+
+async def build_expense_report_data(*, user: Dict[str, Any], month: str) -> ExpenseReportDataResponse:
+    y, m = ym_from_str(month)
+    start, end = month_start_end(y, m)
+
+    match = {
+        "user_id": user["id"],
+        "type": "expense",
+        "date": {"$gte": date_to_dt(start), "$lt": date_to_dt(end)},
+    }
 
-    total_all = rp(sum(r.amount for r in rows))
+    cat_by_id, sub_by_id, pm_by_id = await fetch_report_lookups(user["id"])
+
+    async def fetch_rows() -> Tuple[List[ReportExpenseRow], float]:
+        # iterate the cursor instead of materializing up to 50k docs via to_list
+        rows: List[ReportExpenseRow] = []
+        total_all = 0.0
+        cursor = db.transactions.find(match, TX_REPORT_PROJECTION).sort("date", 1).batch_size(1000)
+        async for tx in cursor:
+            row = _report_row(tx, cat_by_id, sub_by_id, pm_by_id)
+            total_all += row.amount
+            rows.append(row)
+        return rows, total_all
+
+    async def fetch_totals() -> Dict[str, float]:
+        # category totals are grouped server-side instead of re-summed in Python
+        grouped = await db.transactions.aggregate(
+            [
+                {"$match": match},
+                {"$group": {"_id": "$category_id", "total": {"$sum": "$amount"}}},
+            ]
+        ).to_list(5000)
+        return {g["_id"]: float(g.get("total", 0.0)) for g in grouped if g["_id"]}
+
+    # rows and totals are independent queries; overlap their round trips
+    (rows, total_all), totals = await asyncio.gather(fetch_rows(), fetch_totals())
 
     return ExpenseReportDataResponse(
         month=month,
-        total=total_all,
+        total=rp(total_all),
         rows=rows,
-        totals_by_category=totals_by_category,
+        totals_by_category=_sorted_category_totals(totals, cat_by_id),
     )
 
 
-def build_expense_pdf(*, user: Dict[str, Any], month: str, report: ExpenseReportDataResponse) -> bytes:
+# PDF/XLSX encoding is pure CPU; run it on a dedicated pool so it neither
+# blocks the event loop nor steals workers from Motor's I/O threadpool.
+_report_pool = ThreadPoolExecutor(max_workers=os.cpu_count())
+
+# Rendering the PDF/XLSX is the expensive half of an export and the bytes are
+# fully determined by the report content, so cache them keyed by a digest of
+# that content. A changed transaction changes the digest on the next request,
+# so stale entries simply stop being hit; the TTL only bounds memory.
+_report_bytes_cache: TTLCache = TTLCache(maxsize=256, ttl=3600)
+
+
+def report_digest(report: ExpenseReportDataResponse) -> str:
+    return hashlib.blake2b(orjson.dumps(report.model_dump()), digest_size=16).hexdigest()
+
+
+# TableStyle objects are immutable config; build them once instead of per request.
+_PDF_TABLE_STYLE = TableStyle(
+    [
+        ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor("#FBC02D")),
+        ("TEXTCOLOR", (0, 0), (-1, 0), colors.black),
+        ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+        ("FONTSIZE", (0, 0), (-1, 0), 10),
+        ("ALIGN", (0, 0), (-1, -1), "LEFT"),
+        ("ALIGN", (-1, 1), (-1, -1), "RIGHT"),
+        ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
+        ("GRID", (0, 0), (-1, -1), 0.5, colors.HexColor("#DADFE3")),
+        ("ROWBACKGROUNDS", (0, 1), (-1, -1), [colors.white, colors.HexColor("#F6FBFA")]),
+        ("BOTTOMPADDING", (0, 0), (-1, 0), 6),
+        ("TOPPADDING", (0, 0), (-1, 0), 6),
+    ]
+)
+
+_PDF_SUM_TABLE_STYLE = TableStyle(
+    [
+        ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor("#E9F7F5")),
+        ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+        ("GRID", (0, 0), (-1, -1), 0.5, colors.HexColor("#DADFE3")),
+        ("ALIGN", (1, 1), (1, -1), "RIGHT"),
+    ]
+)
+
+
+def build_expense_pdf(*, user: Dict[str, Any], month: str, report: ExpenseReportDataResponse) -> SpooledTemporaryFile:
     y, m = ym_from_str(month)
     month_name = MONTH_NAMES_ID[m - 1]
     current_year = datetime.now().year
 
-    buf = BytesIO()
+    # Spills to disk past 1 MB instead of holding the whole PDF (and a copied
+    # bytes object) in memory.
+    buf = SpooledTemporaryFile(max_size=1_000_000)
     doc = SimpleDocTemplate(
         buf,
         pagesize=A4,
@@ -703,40 +949,22 @@ def build_expense_pdf(*, user: Dict[str, Any], month: str, report: ExpenseReport
     )
     elements.append(Spacer(1, 10))
 
-    # Table
+    # Table: one comprehension, locals bound once to keep the hot loop tight
     header = ["Tanggal", "Kategori", "Subkategori", "Deskripsi", "Metode", "Nominal (Rp)"]
-    data: List[List[str]] = [header]
-
-    for r in report.rows:
-        data.append(
-            [
-                r.date,
-                r.category_name,
-                r.subcategory_name,
-                (r.description or "-")[:60],
-                r.payment_method_name,
-                f"{int(r.amount):,}".replace(",", "."),
-            ]
-        )
+    data: List[List[str]] = [header] + [
+        [
+            r.date,
+            r.category_name,
+            r.subcategory_name,
+            (r.description or "-")[:60],
+            r.payment_method_name,
+            fmt_rp(r.amount),
+        ]
+        for r in report.rows
+    ]
 
     tbl = PdfTable(data, colWidths=[2.1 * cm, 2.5 * cm, 2.7 * cm, 5.5 * cm, 2.5 * cm, 2.6 * cm])
-    tbl.setStyle(
-        TableStyle(
-            [
-                ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor("#FBC02D")),
-                ("TEXTCOLOR", (0, 0), (-1, 0), colors.black),
-                ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
-                ("FONTSIZE", (0, 0), (-1, 0), 10),
-                ("ALIGN", (0, 0), (-1, -1), "LEFT"),
-                ("ALIGN", (-1, 1), (-1, -1), "RIGHT"),
-                ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
-                ("GRID", (0, 0), (-1, -1), 0.5, colors.HexColor("#DADFE3")),
-                ("ROWBACKGROUNDS", (0, 1), (-1, -1), [colors.white, colors.HexColor("#F6FBFA")]),
-                ("BOTTOMPADDING", (0, 0), (-1, 0), 6),
-                ("TOPPADDING", (0, 0), (-1, 0), 6),
-            ]
-        )
-    )
+    tbl.setStyle(_PDF_TABLE_STYLE)
 
     elements.append(tbl)
     elements.append(Spacer(1, 10))
@@ -745,31 +973,17 @@ def build_expense_pdf(*, user: Dict[str, Any], month: str, report: ExpenseReport
     if report.totals_by_category:
         elements.append(Paragraph("<b>Total per kategori</b>", normal))
         elements.append(Spacer(1, 6))
-        sum_data = [["Kategori", "Total (Rp)"]]
-        for t in report.totals_by_category:
-            sum_data.append(
-                [
-                    t.category_name,
-                    f"{int(t.total):,}".replace(",", "."),
-                ]
-            )
+        sum_data = [["Kategori", "Total (Rp)"]] + [
+            [t.category_name, fmt_rp(t.total)] for t in report.totals_by_category
+        ]
         sum_tbl = PdfTable(sum_data, colWidths=[10.3 * cm, 5.6 * cm])
-        sum_tbl.setStyle(
-            TableStyle(
-                [
-                    ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor("#E9F7F5")),
-                    ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
-                    ("GRID", (0, 0), (-1, -1), 0.5, colors.HexColor("#DADFE3")),
-                    ("ALIGN", (1, 1), (1, -1), "RIGHT"),
-                ]
-            )
-        )
+        sum_tbl.setStyle(_PDF_SUM_TABLE_STYLE)
         elements.append(sum_tbl)
         elements.append(Spacer(1, 10))
 
     elements.append(
         Paragraph(
-            f"<b>Total Pengeluaran Bulan Ini:</b> Rp {int(report.total):,}".replace(",", "."),
+            f"<b>Total Pengeluaran Bulan Ini:</b> Rp {fmt_rp(report.total)}",
             normal,
         )
     )
@@ -786,119 +1000,126 @@ def build_expense_pdf(*, user: Dict[str, Any], month: str, report: ExpenseReport
         canvas.restoreState()
 
     doc.build(elements, onFirstPage=on_page, onLaterPages=on_page)
-    return buf.getvalue()
+    buf.seek(0)
+    return buf
+
+
+# Fixed widths per column (auto-width would require re-reading every cell, which
+# streaming mode forbids): Tanggal, Kategori, Subkategori, Deskripsi, Nominal, Metode.
+XLSX_COLUMN_WIDTHS = [12, 16, 22, 40, 14, 20]
+XLSX_COLUMNS = ["Tanggal", "Kategori", "Subkategori", "Deskripsi", "Nominal", "Metode Pembayaran"]
+
+
+def _new_report_workbook(out: SpooledTemporaryFile) -> xlsxwriter.Workbook:
+    # constant_memory streams rows out as they are written instead of keeping
+    # the whole sheet resident; rows must be written top-to-bottom, which both
+    # builders already do.
+    return xlsxwriter.Workbook(out, {"constant_memory": True})
+
+
+def _report_formats(wb: xlsxwriter.Workbook) -> Dict[str, Any]:
+    return {
+        "title": wb.add_format({"bold": True, "font_size": 14}),
+        "header": wb.add_format({"bold": True, "bg_color": "#FBC02D", "align": "center", "valign": "vcenter"}),
+        "bold": wb.add_format({"bold": True}),
+        "rupiah": wb.add_format({"num_format": "#,##0"}),
+        "rupiah_bold": wb.add_format({"num_format": "#,##0", "bold": True}),
+        "cat_header": wb.add_format({"bold": True, "bg_color": "#E9F7F5"}),
+    }
 
 
-def build_expense_xlsx_single_month(*, user: Dict[str, Any], month: str, report: ExpenseReportDataResponse) -> bytes:
+def _set_report_column_widths(ws) -> None:
+    for col_idx, width in enumerate(XLSX_COLUMN_WIDTHS):
+        ws.set_column(col_idx, col_idx, width)
+
+
+def _write_report_rows(ws, fmts: Dict[str, Any], report: ExpenseReportDataResponse, row: int) -> int:
+    for r in report.rows:
+        ws.write_row(row, 0, (r.date, r.category_name, r.subcategory_name, r.description or "-"))
+        ws.write_number(row, 4, int(r.amount), fmts["rupiah"])
+        ws.write_string(row, 5, r.payment_method_name)
+        row += 1
+
+    row += 1
+    ws.write_string(row, 3, "Total Pengeluaran Bulan Ini:", fmts["bold"])
+    ws.write_number(row, 4, int(report.total), fmts["rupiah_bold"])
+    return row + 1
+
+
+def build_expense_xlsx_single_month(*, user: Dict[str, Any], month: str, report: ExpenseReportDataResponse) -> SpooledTemporaryFile:
     y, m = ym_from_str(month)
     month_name = MONTH_NAMES_ID[m - 1]
     sheet_name = f"Laporan_{month_name}_{y}"[:31]
 
-    wb = Workbook()
-    ws = wb.active
-    ws.title = sheet_name
-
-    header_font = Font(bold=True)
-    title_font = Font(bold=True, size=14)
-    fill = PatternFill("solid", fgColor="FBC02D")
-    thin = Side(style="thin", color="DADFE3")
-    border = Border(left=thin, right=thin, top=thin, bottom=thin)
-
-    ws["A1"].value = "CERDAS FINANSIAL"
-    ws["A1"].font = title_font
-    ws["A2"].value = f"Laporan Pengeluaran Bulan {month_name} {y}"
-    ws["A3"].value = f"Pengguna: {user.get('name','-')}"
-
-    start_row = 5
-    columns = ["Tanggal", "Kategori", "Subkategori", "Deskripsi", "Nominal", "Metode Pembayaran"]
-    for col_idx, col_name in enumerate(columns, start=1):
-        cell = ws.cell(row=start_row, column=col_idx, value=col_name)
-        cell.font = header_font
-        cell.fill = fill
-        cell.border = border
-        cell.alignment = Alignment(horizontal="center", vertical="center")
-
-    row_cursor = start_row + 1
-    for r in report.rows:
-        values = [r.date, r.category_name, r.subcategory_name, r.description or "-", int(r.amount), r.payment_method_name]
-        for col_idx, v in enumerate(values, start=1):
-            c = ws.cell(row=row_cursor, column=col_idx, value=v)
-            c.border = border
-            c.alignment = Alignment(vertical="top", wrap_text=True)
-        ws.cell(row=row_cursor, column=5).number_format = "#,##0"
-        ws.cell(row=row_cursor, column=5).alignment = Alignment(horizontal="right", vertical="top")
-        row_cursor += 1
-
-    row_cursor += 1
-    ws.cell(row=row_cursor, column=4, value="Total Pengeluaran Bulan Ini:").font = Font(bold=True)
-    ws.cell(row=row_cursor, column=5, value=int(report.total)).font = Font(bold=True)
-    ws.cell(row=row_cursor, column=5).number_format = "#,##0"
-    ws.cell(row=row_cursor, column=5).alignment = Alignment(horizontal="right")
+    out = SpooledTemporaryFile(max_size=1_000_000)
+    wb = _new_report_workbook(out)
+    fmts = _report_formats(wb)
+    ws = wb.add_worksheet(sheet_name)
+    _set_report_column_widths(ws)
+
+    ws.write_string(0, 0, "CERDAS FINANSIAL", fmts["title"])
+    ws.write_string(1, 0, f"Laporan Pengeluaran Bulan {month_name} {y}")
+    ws.write_string(2, 0, f"Pengguna: {user.get('name','-')}")
+
+    ws.write_row(4, 0, XLSX_COLUMNS, fmts["header"])
+    row = _write_report_rows(ws, fmts, report, 5)
 
     # Totals by category section
-    row_cursor += 2
-    ws.cell(row=row_cursor, column=1, value="Total per Kategori").font = Font(bold=True)
-    row_cursor += 1
-    ws.cell(row=row_cursor, column=1, value="Kategori").font = header_font
-    ws.cell(row=row_cursor, column=2, value="Total").font = header_font
-    ws.cell(row=row_cursor, column=1).fill = PatternFill("solid", fgColor="E9F7F5")
-    ws.cell(row=row_cursor, column=2).fill = PatternFill("solid", fgColor="E9F7F5")
-    row_cursor += 1
+    row += 1
+    ws.write_string(row, 0, "Total per Kategori", fmts["bold"])
+    row += 1
+    ws.write_row(row, 0, ("Kategori", "Total"), fmts["cat_header"])
+    row += 1
     for t in report.totals_by_category:
-        ws.cell(row=row_cursor, column=1, value=t.category_name)
-        ws.cell(row=row_cursor, column=2, value=int(t.total)).number_format = "#,##0"
-        row_cursor += 1
-
-    # Auto width
-    for col in range(1, 7):
-        max_len = 0
-        for cell in ws[get_column_letter(col)]:
-            if cell.value is None:
-                continue
-            max_len = max(max_len, len(str(cell.value)))
-        ws.column_dimensions[get_column_letter(col)].width = min(max(12, max_len + 2), 50)
-
-    out = BytesIO()
-    wb.save(out)
-    return out.getvalue()
-
-
-async def build_expense_xlsx_year(*, user: Dict[str, Any], year: int) -> bytes:
-    wb = Workbook()
-    # remove default sheet
-    default = wb.active
-    wb.remove(default)
+        ws.write_string(row, 0, t.category_name)
+        ws.write_number(row, 1, int(t.total), fmts["rupiah"])
+        row += 1
+
+    wb.close()
+    out.seek(0)
+    return out
+
+
+async def build_expense_xlsx_year(*, user: Dict[str, Any], year: int) -> SpooledTemporaryFile:
+    # One query covers the whole year; rows are bucketed per month in Python
+    # instead of issuing 12 separate finds (plus 12x the same lookups).
+    cat_by_id, sub_by_id, pm_by_id = await fetch_report_lookups(user["id"])
+
+    txs_by_month: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+    cursor = db.transactions.find(
+        {
+            "user_id": user["id"],
+            "type": "expense",
+            "date": {"$gte": date_to_dt(date(year, 1, 1)), "$lt": date_to_dt(date(year + 1, 1, 1))},
+        },
+        TX_REPORT_PROJECTION,
+    ).sort("date", 1).batch_size(1000)
+    async for tx in cursor:
+        txs_by_month[tx["date"].strftime("%Y-%m")].append(tx)
+
+    out = SpooledTemporaryFile(max_size=1_000_000)
+    wb = _new_report_workbook(out)
+    fmts = _report_formats(wb)
 
     for m in range(1, 13):
         month = f"{year}-{str(m).zfill(2)}"
-        report = await build_expense_report_data(user=user, month=month)
+        report = build_expense_report_from_rows(
+            month=month,
+            txs=txs_by_month.get(month, []),
+            cat_by_id=cat_by_id,
+            sub_by_id=sub_by_id,
+            pm_by_id=pm_by_id,
+        )
         month_name = MONTH_NAMES_ID[m - 1]
-        ws = wb.create_sheet(title=f"{month_name}_{year}"[:31])
-
-        ws.append(["Tanggal", "Kategori", "Subkategori", "Deskripsi", "Nominal", "Metode Pembayaran"])
-        for c in ws[1]:
-            c.font = Font(bold=True)
-            c.fill = PatternFill("solid", fgColor="FBC02D")
-            c.alignment = Alignment(horizontal="center")
-
-        for r in report.rows:
-            ws.append([r.date, r.category_name, r.subcategory_name, r.description or "-", int(r.amount), r.payment_method_name])
-        ws.append([])
-        ws.append(["", "", "", "Total Pengeluaran Bulan Ini:", int(report.total), ""])
-        ws[ws.max_row][5].number_format = "#,##0"
-
-        # auto width
-        for col in range(1, 7):
-            max_len = 0
-            for cell in ws[get_column_letter(col)]:
-                if cell.value is None:
-                    continue
-                max_len = max(max_len, len(str(cell.value)))
-            ws.column_dimensions[get_column_letter(col)].width = min(max(12, max_len + 2), 50)
-
-    out = BytesIO()
-    wb.save(out)
-    return out.getvalue()
+        ws = wb.add_worksheet(f"{month_name}_{year}"[:31])
+        _set_report_column_widths(ws)
+
+        ws.write_row(0, 0, XLSX_COLUMNS, fmts["header"])
+        _write_report_rows(ws, fmts, report, 1)
+
+    wb.close()
+    out.seek(0)
+    return out
 
 
 # -------------------------
@@ -915,6 +1136,29 @@ async def adjust_payment_method_balance(*, user_id: str, payment_method_id: str,
         raise HTTPException(status_code=404, detail="Metode pembayaran tidak ditemukan")
 
 
+async def validate_transaction_refs(user_id: str, payload: TransactionIn) -> None:
+    # the three reference checks are independent; overlap their round trips
+    cat, sc, pm = await asyncio.gather(
+        db.categories.find_one({"id": payload.category_id, "user_id": user_id, "kind": payload.type}, {"_id": 0}),
+        db.subcategories.find_one(
+            {
+                "id": payload.subcategory_id,
+                "user_id": user_id,
+                "kind": payload.type,
+                "category_id": payload.category_id,
+            },
+            {"_id": 0},
+        ),
+        db.payment_methods.find_one({"id": payload.payment_method_id, "user_id": user_id}, {"_id": 0}),
+    )
+    if not cat:
+        raise HTTPException(status_code=400, detail="Kategori tidak valid")
+    if not sc:
+        raise HTTPException(status_code=400, detail="Subkategori tidak valid")
+    if not pm:
+        raise HTTPException(status_code=400, detail="Metode pembayaran tidak valid")
+
+
 async def apply_transaction_effect(user_id: str, tx: Dict[str, Any], direction: Literal["apply", "revert"]) -> None:
     # tx.amount: positive
     amt = float(tx["amount"])
@@ -937,8 +1181,20 @@ async def apply_transfer_effect(user_id: str, tr: Dict[str, Any], direction: Lit
         from_delta = -from_delta
         to_delta = -to_delta
 
-    await adjust_payment_method_balance(user_id=user_id, payment_method_id=tr["from_payment_method_id"], delta=from_delta)
-    await adjust_payment_method_balance(user_id=user_id, payment_method_id=tr["to_payment_method_id"], delta=to_delta)
+    # both balance updates in one bulk_write instead of two round trips
+    ops = [
+        UpdateOne(
+            {"id": tr["from_payment_method_id"], "user_id": user_id},
+            {"$inc": {"balance": rp(from_delta)}},
+        ),
+        UpdateOne(
+            {"id": tr["to_payment_method_id"], "user_id": user_id},
+            {"$inc": {"balance": rp(to_delta)}},
+        ),
+    ]
+    res = await db.payment_methods.bulk_write(ops, ordered=False)
+    if res.matched_count != 2:
+        raise HTTPException(status_code=404, detail="Metode pembayaran tidak ditemukan")
 
 
 # -------------------------
@@ -964,13 +1220,16 @@ async def register(payload: RegisterRequest) -> TokenResponse:
     if existing:
         raise HTTPException(status_code=400, detail="Email sudah terdaftar")
 
+    # Hashing is CPU-bound (~100 ms); keep it off the event loop.
+    password_hash = await asyncio.to_thread(hash_password, payload.password)
+
     user_doc = {
         "id": gen_id(),
         "name": payload.name.strip(),
         "email": email,
-        "password_hash": hash_password(payload.password),
+        "password_hash": password_hash,
         "role": "user",
-        "created_at": now_utc().isoformat(),
+        "created_at": now_utc(),
     }
     await db.users.insert_one(user_doc)
     await seed_defaults_for_user(user_doc["id"])
@@ -984,7 +1243,7 @@ async def login(payload: LoginRequest) -> TokenResponse:
     user = await db.users.find_one({"email": email}, {"_id": 0})
     if not user:
         raise HTTPException(status_code=400, detail="Email atau password salah")
-    if not verify_password(payload.password, user.get("password_hash", "")):
+    if not await asyncio.to_thread(verify_password, payload.password, user.get("password_hash", "")):
         raise HTTPException(status_code=400, detail="Email atau password salah")
 
     token = create_access_token(user_id=user["id"], role=user.get("role", "user"))
@@ -1001,7 +1260,13 @@ async def me(user: Dict[str, Any] = Depends(get_current_user)) -> UserPublic:
 
 @api_router.get("/payment-methods", response_model=List[PaymentMethodOut])
 async def list_payment_methods(user: Dict[str, Any] = Depends(get_current_user)) -> List[PaymentMethodOut]:
+    cache_key = (user["id"], "payment-methods")
+    cached = _list_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
     methods = await db.payment_methods.find({"user_id": user["id"]}, {"_id": 0}).sort("name", 1).to_list(1000)
+    _list_cache[cache_key] = methods
     return methods
 
 
@@ -1014,9 +1279,11 @@ async def create_payment_method(
         "user_id": user["id"],
         "name": payload.name.strip(),
         "balance": rp(payload.balance),
-        "created_at": now_utc().isoformat(),
+        "created_at": now_utc(),
     }
     await db.payment_methods.insert_one(doc)
+    invalidate_lookup_cache(user["id"])
+    invalidate_list_cache(user["id"])
     return doc
 
 
@@ -1031,28 +1298,37 @@ async def update_payment_method(
     updated = await db.payment_methods.find_one({"id": payment_method_id, "user_id": user["id"]}, {"_id": 0})
     if not updated:
         raise HTTPException(status_code=404, detail="Metode pembayaran tidak ditemukan")
+    invalidate_lookup_cache(user["id"])
+    invalidate_list_cache(user["id"])
     return updated
 
 
 @api_router.delete("/payment-methods/{payment_method_id}")
 async def delete_payment_method(payment_method_id: str, user: Dict[str, Any] = Depends(get_current_user)) -> Dict[str, str]:
-    # Guard: cannot delete if referenced by transactions/transfers
-    tx_count = await db.transactions.count_documents({"user_id": user["id"], "payment_method_id": payment_method_id})
-    tr_count = await db.transfers.count_documents(
-        {
-            "user_id": user["id"],
-            "$or": [
-                {"from_payment_method_id": payment_method_id},
-                {"to_payment_method_id": payment_method_id},
-            ],
-        }
+    # Guard: cannot delete if referenced by transactions/transfers. find_one
+    # with an _id projection short-circuits on the first match instead of
+    # counting them all, and the two probes overlap in one round trip.
+    tx_ref, tr_ref = await asyncio.gather(
+        db.transactions.find_one({"user_id": user["id"], "payment_method_id": payment_method_id}, {"_id": 1}),
+        db.transfers.find_one(
+            {
+                "user_id": user["id"],
+                "$or": [
+                    {"from_payment_method_id": payment_method_id},
+                    {"to_payment_method_id": payment_method_id},
+                ],
+            },
+            {"_id": 1},
+        ),
     )
-    if tx_count > 0 or tr_count > 0:
+    if tx_ref or tr_ref:
         raise HTTPException(status_code=400, detail="Tidak bisa hapus: metode masih dipakai transaksi/transfer")
 
     res = await db.payment_methods.delete_one({"id": payment_method_id, "user_id": user["id"]})
     if res.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Metode pembayaran tidak ditemukan")
+    invalidate_lookup_cache(user["id"])
+    invalidate_list_cache(user["id"])
     return {"status": "ok"}
 
 
@@ -1064,7 +1340,13 @@ async def list_categories(
     kind: Kind = Query(...),
     user: Dict[str, Any] = Depends(get_current_user),
 ) -> List[CategoryOut]:
+    cache_key = (user["id"], "categories", kind)
+    cached = _list_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
     cats = await db.categories.find({"user_id": user["id"], "kind": kind}, {"_id": 0}).sort("name", 1).to_list(1000)
+    _list_cache[cache_key] = cats
     return cats
 
 
@@ -1075,9 +1357,11 @@ async def create_category(payload: CategoryIn, user: Dict[str, Any] = Depends(ge
         "user_id": user["id"],
         "kind": payload.kind,
         "name": payload.name.strip(),
-        "created_at": now_utc().isoformat(),
+        "created_at": now_utc(),
     }
     await db.categories.insert_one(doc)
+    invalidate_lookup_cache(user["id"])
+    invalidate_list_cache(user["id"])
     return doc
 
 
@@ -1090,18 +1374,22 @@ async def update_category(category_id: str, payload: CategoryIn, user: Dict[str,
     updated = await db.categories.find_one({"id": category_id, "user_id": user["id"]}, {"_id": 0})
     if not updated:
         raise HTTPException(status_code=404, detail="Kategori tidak ditemukan")
+    invalidate_lookup_cache(user["id"])
+    invalidate_list_cache(user["id"])
     return updated
 
 
 @api_router.delete("/categories/{category_id}")
 async def delete_category(category_id: str, user: Dict[str, Any] = Depends(get_current_user)) -> Dict[str, str]:
-    sub_count = await db.subcategories.count_documents({"user_id": user["id"], "category_id": category_id})
-    if sub_count > 0:
+    # existence probe instead of count_documents: stops at the first match
+    if await db.subcategories.find_one({"user_id": user["id"], "category_id": category_id}, {"_id": 1}):
         raise HTTPException(status_code=400, detail="Hapus subkategori dulu sebelum hapus kategori")
 
     res = await db.categories.delete_one({"id": category_id, "user_id": user["id"]})
     if res.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Kategori tidak ditemukan")
+    invalidate_lookup_cache(user["id"])
+    invalidate_list_cache(user["id"])
     return {"status": "ok"}
 
 
@@ -1114,10 +1402,16 @@ async def list_subcategories(
     category_id: Optional[str] = Query(None),
     user: Dict[str, Any] = Depends(get_current_user),
 ) -> List[SubcategoryOut]:
+    cache_key = (user["id"], "subcategories", kind, category_id)
+    cached = _list_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
     q: Dict[str, Any] = {"user_id": user["id"], "kind": kind}
     if category_id:
         q["category_id"] = category_id
     subs = await db.subcategories.find(q, {"_id": 0}).sort("name", 1).to_list(5000)
+    _list_cache[cache_key] = subs
     return subs
 
 
@@ -1133,7 +1427,7 @@ async def create_subcategory(payload: SubcategoryIn, user: Dict[str, Any] = Depe
         "kind": payload.kind,
         "category_id": payload.category_id,
         "name": payload.name.strip(),
-        "created_at": now_utc().isoformat(),
+        "created_at": now_utc(),
     }
     await db.subcategories.insert_one(doc)
 
@@ -1160,6 +1454,8 @@ async def create_subcategory(payload: SubcategoryIn, user: Dict[str, Any] = Depe
             upsert=True,
         )
 
+    invalidate_lookup_cache(user["id"])
+    invalidate_list_cache(user["id"])
     return doc
 
 
@@ -1176,19 +1472,23 @@ async def update_subcategory(subcategory_id: str, payload: SubcategoryIn, user:
     updated = await db.subcategories.find_one({"id": subcategory_id, "user_id": user["id"]}, {"_id": 0})
     if not updated:
         raise HTTPException(status_code=404, detail="Subkategori tidak ditemukan")
+    invalidate_lookup_cache(user["id"])
+    invalidate_list_cache(user["id"])
     return updated
 
 
 @api_router.delete("/subcategories/{subcategory_id}")
 async def delete_subcategory(subcategory_id: str, user: Dict[str, Any] = Depends(get_current_user)) -> Dict[str, str]:
-    tx_count = await db.transactions.count_documents({"user_id": user["id"], "subcategory_id": subcategory_id})
-    if tx_count > 0:
+    # existence probe instead of count_documents: stops at the first match
+    if await db.transactions.find_one({"user_id": user["id"], "subcategory_id": subcategory_id}, {"_id": 1}):
         raise HTTPException(status_code=400, detail="Tidak bisa hapus: subkategori dipakai transaksi")
 
     await db.budgets.delete_many({"user_id": user["id"], "subcategory_id": subcategory_id})
     res = await db.subcategories.delete_one({"id": subcategory_id, "user_id": user["id"]})
     if res.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Subkategori tidak ditemukan")
+    invalidate_lookup_cache(user["id"])
+    invalidate_list_cache(user["id"])
     return {"status": "ok"}
 
 
@@ -1203,50 +1503,93 @@ async def budgets_overview(
     y, m = ym_from_str(month)
     start, end = month_start_end(y, m)
 
-    subs = await db.subcategories.find(
-        {"user_id": user["id"], "kind": "expense"},
-        {"_id": 0, "id": 1, "name": 1, "category_id": 1},
-    ).to_list(5000)
-    cats = await db.categories.find(
-        {"user_id": user["id"], "kind": "expense"},
-        {"_id": 0, "id": 1, "name": 1},
-    ).to_list(1000)
-    cat_by_id = {c["id"]: c for c in cats}
+    cache_key = (user["id"], "budgets-overview", month)
+    cached = _list_cache.get(cache_key)
+    if cached is not None:
+        return cached
 
-    budgets = await db.budgets.find(
-        {"user_id": user["id"], "year": y, "month": m},
-        {"_id": 0, "subcategory_id": 1, "amount": 1},
-    ).to_list(5000)
-    budget_by_sc = {b["subcategory_id"]: float(b.get("amount", 0.0)) for b in budgets}
-
-    # spending per subcategory for month
-    expense_txs = await db.transactions.find(
+    # one aggregation joins categories, this month's budget row and the
+    # spent-sum per subcategory server-side, replacing three finds plus an
+    # up-to-5000x10000 Python-side join
+    pipeline = [
+        {"$match": {"user_id": user["id"], "kind": "expense"}},
         {
-            "user_id": user["id"],
-            "type": "expense",
-            "date": {"$gte": start.isoformat(), "$lt": end.isoformat()},
+            "$lookup": {
+                "from": "categories",
+                "localField": "category_id",
+                "foreignField": "id",
+                "as": "category",
+            }
+        },
+        {
+            "$lookup": {
+                "from": "budgets",
+                "let": {"sc_id": "$id", "uid": "$user_id"},
+                "pipeline": [
+                    {
+                        "$match": {
+                            "year": y,
+                            "month": m,
+                            "$expr": {
+                                "$and": [
+                                    {"$eq": ["$subcategory_id", "$$sc_id"]},
+                                    {"$eq": ["$user_id", "$$uid"]},
+                                ]
+                            },
+                        }
+                    },
+                    {"$project": {"_id": 0, "amount": 1}},
+                ],
+                "as": "budget",
+            }
+        },
+        {
+            "$lookup": {
+                "from": "transactions",
+                "let": {"sc_id": "$id", "uid": "$user_id"},
+                "pipeline": [
+                    {
+                        "$match": {
+                            "type": "expense",
+                            "date": {"$gte": date_to_dt(start), "$lt": date_to_dt(end)},
+                            "$expr": {
+                                "$and": [
+                                    {"$eq": ["$subcategory_id", "$$sc_id"]},
+                                    {"$eq": ["$user_id", "$$uid"]},
+                                ]
+                            },
+                        }
+                    },
+                    {"$group": {"_id": None, "s": {"$sum": "$amount"}}},
+                ],
+                "as": "spent",
+            }
         },
-        {"_id": 0, "subcategory_id": 1, "amount": 1},
-    ).to_list(10000)
-    spent_by_sc: Dict[str, float] = {}
-    for tx in expense_txs:
-        scid = tx["subcategory_id"]
-        spent_by_sc[scid] = float(spent_by_sc.get(scid, 0.0)) + float(tx.get("amount", 0.0))
+        {
+            "$project": {
+                "_id": 0,
+                "subcategory_id": "$id",
+                "subcategory_name": "$name",
+                "category_name": {"$ifNull": [{"$arrayElemAt": ["$category.name", 0]}, "-"]},
+                "budget": {"$ifNull": [{"$arrayElemAt": ["$budget.amount", 0]}, 0]},
+                "spent": {"$ifNull": [{"$arrayElemAt": ["$spent.s", 0]}, 0]},
+            }
+        },
+    ]
 
     rows: List[BudgetRow] = []
-    for sc in subs:
-        budget = float(budget_by_sc.get(sc["id"], 0.0))
-        spent = float(spent_by_sc.get(sc["id"], 0.0))
+    async for doc in db.subcategories.aggregate(pipeline):
+        budget = float(doc.get("budget", 0.0))
+        spent = float(doc.get("spent", 0.0))
         remaining = budget - spent
         percent = 0.0
         if budget > 0:
             percent = max(0.0, min(100.0, (spent / budget) * 100.0))
-        cat_name = cat_by_id.get(sc["category_id"], {}).get("name", "-")
         rows.append(
             BudgetRow(
-                subcategory_id=sc["id"],
-                subcategory_name=sc["name"],
-                category_name=cat_name,
+                subcategory_id=doc["subcategory_id"],
+                subcategory_name=doc["subcategory_name"],
+                category_name=doc.get("category_name", "-"),
                 budget=rp(budget),
                 spent=rp(spent),
                 remaining=rp(remaining),
@@ -1257,23 +1600,33 @@ async def budgets_overview(
     # sort by percent desc then name
     rows.sort(key=lambda r: (-r.percent, r.subcategory_name.lower()))
 
-    return BudgetOverviewResponse(month=month, rows=rows)
+    resp = BudgetOverviewResponse(month=month, rows=rows)
+    _list_cache[cache_key] = resp
+    return resp
 
 
 @api_router.put("/budgets")
 async def budgets_upsert(payload: BudgetBatchUpsert, user: Dict[str, Any] = Depends(get_current_user)) -> Dict[str, str]:
     y, m = ym_from_str(payload.month)
 
-    for item in payload.items:
-        # validate subcategory belongs to user and is expense
-        sc = await db.subcategories.find_one(
-            {"id": item.subcategory_id, "user_id": user["id"], "kind": "expense"},
-            {"_id": 0},
+    if not payload.items:
+        return {"status": "ok"}
+
+    # validate all referenced subcategories in one query, then upsert all
+    # amounts in one bulk_write: O(2) round trips instead of O(2N)
+    sub_ids = [item.subcategory_id for item in payload.items]
+    valid_ids = {
+        s["id"]
+        async for s in db.subcategories.find(
+            {"user_id": user["id"], "kind": "expense", "id": {"$in": sub_ids}},
+            {"_id": 0, "id": 1},
         )
-        if not sc:
-            raise HTTPException(status_code=400, detail="Subkategori tidak valid")
+    }
+    if set(sub_ids) - valid_ids:
+        raise HTTPException(status_code=400, detail="Subkategori tidak valid")
 
-        await db.budgets.update_one(
+    ops = [
+        UpdateOne(
             {
                 "user_id": user["id"],
                 "year": y,
@@ -1292,6 +1645,10 @@ async def budgets_upsert(payload: BudgetBatchUpsert, user: Dict[str, Any] = Depe
             },
             upsert=True,
         )
+        for item in payload.items
+    ]
+    await db.budgets.bulk_write(ops, ordered=False)
+    invalidate_list_cache(user["id"])
 
     return {"status": "ok"}
 
@@ -1313,14 +1670,22 @@ async def expense_report_pdf(
     user: Dict[str, Any] = Depends(get_current_user),
 ):
     report = await build_expense_report_data(user=user, month=month)
-    pdf_bytes = build_expense_pdf(user=user, month=month, report=report)
+    cache_key = (user["id"], "pdf", month, report_digest(report))
+    data = _report_bytes_cache.get(cache_key)
+    if data is None:
+        pdf_file = await asyncio.get_running_loop().run_in_executor(
+            _report_pool, partial(build_expense_pdf, user=user, month=month, report=report)
+        )
+        data = pdf_file.read()
+        pdf_file.close()
+        _report_bytes_cache[cache_key] = data
 
     filename = safe_filename(f"Laporan_Pengeluaran_{month}_{user.get('name','User')}.pdf")
     headers = {
         "Content-Disposition": f"attachment; filename*=UTF-8''{filename}",
         "Cache-Control": "no-store",
     }
-    return StreamingResponse(BytesIO(pdf_bytes), media_type="application/pdf", headers=headers)
+    return StreamingResponse(BytesIO(data), media_type="application/pdf", headers=headers)
 
 
 @api_router.get("/reports/expenses/xlsx")
@@ -1329,7 +1694,15 @@ async def expense_report_xlsx(
     user: Dict[str, Any] = Depends(get_current_user),
 ):
     report = await build_expense_report_data(user=user, month=month)
-    xlsx_bytes = build_expense_xlsx_single_month(user=user, month=month, report=report)
+    cache_key = (user["id"], "xlsx", month, report_digest(report))
+    data = _report_bytes_cache.get(cache_key)
+    if data is None:
+        xlsx_file = await asyncio.get_running_loop().run_in_executor(
+            _report_pool, partial(build_expense_xlsx_single_month, user=user, month=month, report=report)
+        )
+        data = xlsx_file.read()
+        xlsx_file.close()
+        _report_bytes_cache[cache_key] = data
 
     filename = safe_filename(f"Laporan_Pengeluaran_{month}_{user.get('name','User')}.xlsx")
     headers = {
@@ -1337,7 +1710,7 @@ async def expense_report_xlsx(
         "Cache-Control": "no-store",
     }
     return StreamingResponse(
-        BytesIO(xlsx_bytes),
+        BytesIO(data),
         media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
         headers=headers,
     )
@@ -1348,7 +1721,7 @@ async def expense_report_xlsx_year(
     year: int = Query(..., ge=2000, le=2100),
     user: Dict[str, Any] = Depends(get_current_user),
 ):
-    xlsx_bytes = await build_expense_xlsx_year(user=user, year=year)
+    xlsx_file = await build_expense_xlsx_year(user=user, year=year)
 
     filename = safe_filename(f"Laporan_Pengeluaran_{year}_{user.get('name','User')}.xlsx")
     headers = {
@@ -1356,7 +1729,7 @@ async def expense_report_xlsx_year(
         "Cache-Control": "no-store",
     }
     return StreamingResponse(
-        BytesIO(xlsx_bytes),
+        xlsx_file,
         media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
         headers=headers,
     )
@@ -1369,119 +1742,146 @@ async def expense_report_xlsx_year(
 async def list_transactions(
     type: TxType = Query(...),
     month: str = Query(...),
+    page: int = Query(0, ge=0),
+    page_size: Optional[int] = Query(None, ge=1, le=500),
     user: Dict[str, Any] = Depends(get_current_user),
 ) -> List[TransactionOut]:
     y, m = ym_from_str(month)
     start, end = month_start_end(y, m)
-    txs = await db.transactions.find(
+    # one aggregation joins the parent names so the frontend does not issue
+    # N+1 follow-up fetches per row; $match/$sort run first on the index
+    pipeline = [
         {
-            "user_id": user["id"],
-            "type": type,
-            "date": {"$gte": start.isoformat(), "$lt": end.isoformat()},
+            "$match": {
+                "user_id": user["id"],
+                "type": type,
+                "date": {"$gte": date_to_dt(start), "$lt": date_to_dt(end)},
+            }
         },
-        {"_id": 0},
-    ).sort("date", -1).to_list(10000)
-    return txs
+        {"$sort": {"date": -1}},
+        # paginate before the lookups so only the visible page is joined and
+        # shipped; page_size is opt-in to keep existing callers whole-month
+        *([{"$skip": page * page_size}, {"$limit": page_size}] if page_size else []),
+        {
+            "$lookup": {
+                "from": "categories",
+                "localField": "category_id",
+                "foreignField": "id",
+                "as": "cat",
+                "pipeline": [{"$project": {"_id": 0, "name": 1}}],
+            }
+        },
+        {
+            "$lookup": {
+                "from": "subcategories",
+                "localField": "subcategory_id",
+                "foreignField": "id",
+                "as": "sub",
+                "pipeline": [{"$project": {"_id": 0, "name": 1}}],
+            }
+        },
+        {
+            "$lookup": {
+                "from": "payment_methods",
+                "localField": "payment_method_id",
+                "foreignField": "id",
+                "as": "pm",
+                "pipeline": [{"$project": {"_id": 0, "name": 1}}],
+            }
+        },
+        {
+            "$addFields": {
+                "category_name": {"$first": "$cat.name"},
+                "subcategory_name": {"$first": "$sub.name"},
+                "payment_method_name": {"$first": "$pm.name"},
+            }
+        },
+        {"$project": {"_id": 0, "cat": 0, "sub": 0, "pm": 0}},
+    ]
+    txs = db.transactions.aggregate(pipeline, batchSize=1000)
+    return [with_date_str(t) async for t in txs]
 
 
 @api_router.post("/transactions", response_model=TransactionOut)
 async def create_transaction(payload: TransactionIn, user: Dict[str, Any] = Depends(get_current_user)) -> TransactionOut:
-    _ = date_from_str(payload.date)
+    tx_date = date_from_str(payload.date)
 
     # validate references belong to user
-    cat = await db.categories.find_one({"id": payload.category_id, "user_id": user["id"], "kind": payload.type}, {"_id": 0})
-    if not cat:
-        raise HTTPException(status_code=400, detail="Kategori tidak valid")
-    sc = await db.subcategories.find_one(
-        {
-            "id": payload.subcategory_id,
-            "user_id": user["id"],
-            "kind": payload.type,
-            "category_id": payload.category_id,
-        },
-        {"_id": 0},
-    )
-    if not sc:
-        raise HTTPException(status_code=400, detail="Subkategori tidak valid")
-
-    pm = await db.payment_methods.find_one({"id": payload.payment_method_id, "user_id": user["id"]}, {"_id": 0})
-    if not pm:
-        raise HTTPException(status_code=400, detail="Metode pembayaran tidak valid")
+    await validate_transaction_refs(user["id"], payload)
 
     doc = {
         "id": gen_id(),
         "user_id": user["id"],
         "type": payload.type,
-        "date": payload.date,
+        "date": date_to_dt(tx_date),
         "category_id": payload.category_id,
         "subcategory_id": payload.subcategory_id,
         "description": (payload.description or "").strip(),
         "amount": rp(payload.amount),
         "payment_method_id": payload.payment_method_id,
-        "created_at": now_utc().isoformat(),
-        "updated_at": now_utc().isoformat(),
+        "created_at": now_utc(),
+        "updated_at": now_utc(),
     }
 
     await db.transactions.insert_one(doc)
     await apply_transaction_effect(user["id"], doc, "apply")
-    return doc
+    invalidate_list_cache(user["id"])
+    return with_date_str(doc)
 
 
 @api_router.put("/transactions/{transaction_id}", response_model=TransactionOut)
 async def update_transaction(
     transaction_id: str, payload: TransactionIn, user: Dict[str, Any] = Depends(get_current_user)
 ) -> TransactionOut:
-    _ = date_from_str(payload.date)
+    tx_date = date_from_str(payload.date)
 
-    existing = await db.transactions.find_one({"id": transaction_id, "user_id": user["id"]}, {"_id": 0})
+    # fetch + validate in one overlapped round trip (validation raises its
+    # own 400s; a missing transaction still 404s below)
+    existing, _ = await asyncio.gather(
+        db.transactions.find_one({"id": transaction_id, "user_id": user["id"]}, {"_id": 0}),
+        validate_transaction_refs(user["id"], payload),
+    )
     if not existing:
         raise HTTPException(status_code=404, detail="Transaksi tidak ditemukan")
 
-    # validate
-    cat = await db.categories.find_one({"id": payload.category_id, "user_id": user["id"], "kind": payload.type}, {"_id": 0})
-    if not cat:
-        raise HTTPException(status_code=400, detail="Kategori tidak valid")
-
-    sc = await db.subcategories.find_one(
-        {
-            "id": payload.subcategory_id,
-            "user_id": user["id"],
-            "kind": payload.type,
-            "category_id": payload.category_id,
-        },
-        {"_id": 0},
-    )
-    if not sc:
-        raise HTTPException(status_code=400, detail="Subkategori tidak valid")
-
-    pm = await db.payment_methods.find_one({"id": payload.payment_method_id, "user_id": user["id"]}, {"_id": 0})
-    if not pm:
-        raise HTTPException(status_code=400, detail="Metode pembayaran tidak valid")
-
-    # revert old effect then apply new
-    await apply_transaction_effect(user["id"], existing, "revert")
-
     new_doc = {
         **existing,
         "type": payload.type,
-        "date": payload.date,
+        "date": date_to_dt(tx_date),
         "category_id": payload.category_id,
         "subcategory_id": payload.subcategory_id,
         "description": (payload.description or "").strip(),
         "amount": rp(payload.amount),
         "payment_method_id": payload.payment_method_id,
-        "updated_at": now_utc().isoformat(),
+        "updated_at": now_utc(),
     }
 
-    await db.transactions.update_one(
-        {"id": transaction_id, "user_id": user["id"]},
-        {"$set": {k: v for k, v in new_doc.items() if k != "id"}},
-    )
+    # revert the old balance effect and apply the new one as a single
+    # bulk_write; when the payment method is unchanged the two deltas
+    # collapse into one $inc, so there is no window with a half-applied
+    # balance on that method
+    deltas: Dict[str, int] = defaultdict(int)
+    old_amt = rp(existing["amount"])
+    deltas[existing["payment_method_id"]] += old_amt if existing["type"] == "expense" else -old_amt
+    deltas[new_doc["payment_method_id"]] += -new_doc["amount"] if new_doc["type"] == "expense" else new_doc["amount"]
+    balance_ops = [
+        UpdateOne({"id": pm_id, "user_id": user["id"]}, {"$inc": {"balance": delta}})
+        for pm_id, delta in deltas.items()
+        if delta
+    ]
 
-    await apply_transaction_effect(user["id"], new_doc, "apply")
+    writes = [
+        db.transactions.update_one(
+            {"id": transaction_id, "user_id": user["id"]},
+            {"$set": {k: v for k, v in new_doc.items() if k != "id"}},
+        )
+    ]
+    if balance_ops:
+        writes.append(db.payment_methods.bulk_write(balance_ops, ordered=False))
+    await asyncio.gather(*writes)
 
-    updated = await db.transactions.find_one({"id": transaction_id, "user_id": user["id"]}, {"_id": 0})
-    return updated
+    invalidate_list_cache(user["id"])
+    return with_date_str(new_doc)
 
 
 @api_router.delete("/transactions/{transaction_id}")
@@ -1492,6 +1892,7 @@ async def delete_transaction(transaction_id: str, user: Dict[str, Any] = Depends
 
     await apply_transaction_effect(user["id"], existing, "revert")
     await db.transactions.delete_one({"id": transaction_id, "user_id": user["id"]})
+    invalidate_list_cache(user["id"])
     return {"status": "ok"}
 
 
@@ -1505,46 +1906,49 @@ async def list_transfers(
 ) -> List[TransferOut]:
     y, m = ym_from_str(month)
     start, end = month_start_end(y, m)
-    trs = await db.transfers.find(
-        {"user_id": user["id"], "date": {"$gte": start.isoformat(), "$lt": end.isoformat()}},
+    trs = db.transfers.find(
+        {"user_id": user["id"], "date": {"$gte": date_to_dt(start), "$lt": date_to_dt(end)}},
         {"_id": 0},
-    ).sort("date", -1).to_list(10000)
-    return trs
+    ).sort("date", -1).batch_size(1000)
+    return [with_date_str(t) async for t in trs]
 
 
 @api_router.post("/transfers", response_model=TransferOut)
 async def create_transfer(payload: TransferIn, user: Dict[str, Any] = Depends(get_current_user)) -> TransferOut:
-    _ = date_from_str(payload.date)
+    tr_date = date_from_str(payload.date)
 
     if payload.from_payment_method_id == payload.to_payment_method_id:
         raise HTTPException(status_code=400, detail="Metode asal dan tujuan tidak boleh sama")
 
     # validate payment methods
-    from_pm = await db.payment_methods.find_one({"id": payload.from_payment_method_id, "user_id": user["id"]}, {"_id": 0})
-    to_pm = await db.payment_methods.find_one({"id": payload.to_payment_method_id, "user_id": user["id"]}, {"_id": 0})
+    from_pm, to_pm = await asyncio.gather(
+        db.payment_methods.find_one({"id": payload.from_payment_method_id, "user_id": user["id"]}, {"_id": 0}),
+        db.payment_methods.find_one({"id": payload.to_payment_method_id, "user_id": user["id"]}, {"_id": 0}),
+    )
     if not from_pm or not to_pm:
         raise HTTPException(status_code=400, detail="Metode pembayaran tidak valid")
 
     doc = {
         "id": gen_id(),
         "user_id": user["id"],
-        "date": payload.date,
+        "date": date_to_dt(tr_date),
         "from_payment_method_id": payload.from_payment_method_id,
         "to_payment_method_id": payload.to_payment_method_id,
         "amount": rp(payload.amount),
         "description": (payload.description or "").strip(),
-        "created_at": now_utc().isoformat(),
-        "updated_at": now_utc().isoformat(),
+        "created_at": now_utc(),
+        "updated_at": now_utc(),
     }
 
     await db.transfers.insert_one(doc)
     await apply_transfer_effect(user["id"], doc, "apply")
-    return doc
+    invalidate_list_cache(user["id"])
+    return with_date_str(doc)
 
 
 @api_router.put("/transfers/{transfer_id}", response_model=TransferOut)
 async def update_transfer(transfer_id: str, payload: TransferIn, user: Dict[str, Any] = Depends(get_current_user)) -> TransferOut:
-    _ = date_from_str(payload.date)
+    tr_date = date_from_str(payload.date)
 
     if payload.from_payment_method_id == payload.to_payment_method_id:
         raise HTTPException(status_code=400, detail="Metode asal dan tujuan tidak boleh sama")
@@ -1553,8 +1957,10 @@ async def update_transfer(transfer_id: str, payload: TransferIn, user: Dict[str,
     if not existing:
         raise HTTPException(status_code=404, detail="Transfer tidak ditemukan")
 
-    from_pm = await db.payment_methods.find_one({"id": payload.from_payment_method_id, "user_id": user["id"]}, {"_id": 0})
-    to_pm = await db.payment_methods.find_one({"id": payload.to_payment_method_id, "user_id": user["id"]}, {"_id": 0})
+    from_pm, to_pm = await asyncio.gather(
+        db.payment_methods.find_one({"id": payload.from_payment_method_id, "user_id": user["id"]}, {"_id": 0}),
+        db.payment_methods.find_one({"id": payload.to_payment_method_id, "user_id": user["id"]}, {"_id": 0}),
+    )
     if not from_pm or not to_pm:
         raise HTTPException(status_code=400, detail="Metode pembayaran tidak valid")
 
@@ -1562,12 +1968,12 @@ async def update_transfer(transfer_id: str, payload: TransferIn, user: Dict[str,
 
     new_doc = {
         **existing,
-        "date": payload.date,
+        "date": date_to_dt(tr_date),
         "from_payment_method_id": payload.from_payment_method_id,
         "to_payment_method_id": payload.to_payment_method_id,
         "amount": rp(payload.amount),
         "description": (payload.description or "").strip(),
-        "updated_at": now_utc().isoformat(),
+        "updated_at": now_utc(),
     }
 
     await db.transfers.update_one(
@@ -1578,7 +1984,8 @@ async def update_transfer(transfer_id: str, payload: TransferIn, user: Dict[str,
     await apply_transfer_effect(user["id"], new_doc, "apply")
 
     updated = await db.transfers.find_one({"id": transfer_id, "user_id": user["id"]}, {"_id": 0})
-    return updated
+    invalidate_list_cache(user["id"])
+    return with_date_str(updated)
 
 
 @api_router.delete("/transfers/{transfer_id}")
@@ -1589,6 +1996,7 @@ async def delete_transfer(transfer_id: str, user: Dict[str, Any] = Depends(get_c
 
     await apply_transfer_effect(user["id"], existing, "revert")
     await db.transfers.delete_one({"id": transfer_id, "user_id": user["id"]})
+    invalidate_list_cache(user["id"])
     return {"status": "ok"}
 
 
@@ -1604,53 +2012,85 @@ async def dashboard_overview(
     y, m = ym_from_str(month)
     start, end = month_start_end(y, m)
 
-    income_txs = await db.transactions.find(
-        {"user_id": user["id"], "type": "income", "date": {"$gte": start.isoformat(), "$lt": end.isoformat()}},
-        {"_id": 0, "amount": 1, "date": 1},
-    ).to_list(20000)
-    expense_txs = await db.transactions.find(
-        {"user_id": user["id"], "type": "expense", "date": {"$gte": start.isoformat(), "$lt": end.isoformat()}},
-        {"_id": 0, "amount": 1, "date": 1},
-    ).to_list(20000)
-
-    income_total = sum(float(t.get("amount", 0.0)) for t in income_txs)
-    expense_total = sum(float(t.get("amount", 0.0)) for t in expense_txs)
-    net_total = income_total - expense_total
-
-    today_iso = datetime.now().date().isoformat()
-    today_expense_total = sum(float(t.get("amount", 0.0)) for t in expense_txs if t.get("date") == today_iso)
-
-    methods = await db.payment_methods.find({"user_id": user["id"]}, {"_id": 0}).sort("name", 1).to_list(1000)
-
     # daily expense last N days (ending today) within selected month (if month not current, still compute within that month)
     # We'll compute points from max(start, end-days) to min(end-1, today) if same month.
-    end_date = min(end, datetime.now().date() + timedelta(days=1))
-    start_days = end_date - timedelta(days=days)
-    start_date = max(start, start_days)
-
-    # group expense by date
-    daily_map: Dict[str, float] = {}
-    for t in expense_txs:
-        d = t.get("date")
-        if not d:
-            continue
-        if d < start_date.isoformat() or d >= end_date.isoformat():
+    today = datetime.now().date()
+    end_date = min(end, today + timedelta(days=1))
+    start_date = max(start, end_date - timedelta(days=days))
+
+    # the five reads are independent; run them concurrently on the pool.
+    # Income/expense sums are reduced server-side per (type, day), and the
+    # daily series comes back already densified and zero-filled per day, so
+    # Python only maps the window's buckets into response models.
+    grouped, daily, methods, budget_resp, transfers = await asyncio.gather(
+        db.transactions.aggregate(
+            [
+                {
+                    "$match": {
+                        "user_id": user["id"],
+                        "type": {"$in": ["income", "expense"]},
+                        "date": {"$gte": date_to_dt(start), "$lt": date_to_dt(end)},
+                    }
+                },
+                {"$group": {"_id": {"type": "$type", "date": "$date"}, "amount": {"$sum": "$amount"}}},
+            ]
+        ).to_list(1000),
+        db.transactions.aggregate(
+            [
+                {
+                    "$match": {
+                        "user_id": user["id"],
+                        "type": "expense",
+                        "date": {"$gte": date_to_dt(start_date), "$lt": date_to_dt(end_date)},
+                    }
+                },
+                {"$group": {"_id": "$date", "amount": {"$sum": "$amount"}}},
+                {
+                    "$densify": {
+                        "field": "_id",
+                        "range": {
+                            "step": 1,
+                            "unit": "day",
+                            "bounds": [date_to_dt(start_date), date_to_dt(end_date)],
+                        },
+                    }
+                },
+                {"$fill": {"output": {"amount": {"value": 0}}}},
+                {"$sort": {"_id": 1}},
+            ]
+        ).to_list(200),
+        db.payment_methods.find({"user_id": user["id"]}, {"_id": 0}).sort("name", 1).to_list(1000),
+        budgets_overview(month=month, user=user),  # reuse logic
+        db.transfers.find(
+            {"user_id": user["id"], "date": {"$gte": date_to_dt(start), "$lt": date_to_dt(end)}},
+            {"_id": 0},
+        ).sort("date", -1).limit(20).to_list(20),
+    )
+    transfers = [with_date_str(t) for t in transfers]
+
+    income_total = 0.0
+    expense_total = 0.0
+    today_expense_total = 0.0
+    for g in grouped:
+        amt = float(g.get("amount", 0.0))
+        key = g["_id"]
+        if key.get("type") == "income":
+            income_total += amt
             continue
-        daily_map[d] = daily_map.get(d, 0.0) + float(t.get("amount", 0.0))
-
-    points: List[DailySpendPoint] = []
-    cursor = start_date
-    while cursor < end_date:
-        iso = cursor.isoformat()
-        points.append(DailySpendPoint(date=iso, amount=rp(daily_map.get(iso, 0.0))))
-        cursor = cursor + timedelta(days=1)
-
-    budget_resp = await budgets_overview(month=month, user=user)  # reuse logic
+        expense_total += amt
+        d = key.get("date")
+        if isinstance(d, datetime) and d.date() == today:
+            today_expense_total += amt
+    net_total = income_total - expense_total
 
-    transfers = await db.transfers.find(
-        {"user_id": user["id"], "date": {"$gte": start.isoformat(), "$lt": end.isoformat()}},
-        {"_id": 0},
-    ).sort("date", -1).limit(20).to_list(20)
+    points = [DailySpendPoint(date=d["_id"].date().isoformat(), amount=rp(d.get("amount") or 0)) for d in daily]
+    if not points:
+        # $densify emits nothing when the window has no expenses at all;
+        # synthesize the zero series so the chart keeps its full x-axis
+        points = [
+            DailySpendPoint(date=(start_date + timedelta(days=i)).isoformat(), amount=0)
+            for i in range((end_date - start_date).days)
+        ]
 
     return DashboardOverviewResponse(
         month=month,
@@ -1679,15 +2119,20 @@ async def admin_delete_user(user_id: str, admin: Dict[str, Any] = Depends(get_cu
     if user_id == admin["id"]:
         raise HTTPException(status_code=400, detail="Tidak bisa menghapus akun admin sendiri")
 
-    await db.transactions.delete_many({"user_id": user_id})
-    await db.transfers.delete_many({"user_id": user_id})
-    await db.budgets.delete_many({"user_id": user_id})
-    await db.subcategories.delete_many({"user_id": user_id})
-    await db.categories.delete_many({"user_id": user_id})
-    await db.payment_methods.delete_many({"user_id": user_id})
+    # the per-collection deletes are independent; run them concurrently
+    await asyncio.gather(
+        db.transactions.delete_many({"user_id": user_id}),
+        db.transfers.delete_many({"user_id": user_id}),
+        db.budgets.delete_many({"user_id": user_id}),
+        db.subcategories.delete_many({"user_id": user_id}),
+        db.categories.delete_many({"user_id": user_id}),
+        db.payment_methods.delete_many({"user_id": user_id}),
+    )
     res = await db.users.delete_one({"id": user_id})
     if res.deleted_count == 0:
         raise HTTPException(status_code=404, detail="User tidak ditemukan")
+    invalidate_lookup_cache(user_id)
+    invalidate_list_cache(user_id)
     return {"status": "ok"}
 
 